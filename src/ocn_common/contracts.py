@@ -5,16 +5,64 @@ This module provides utilities for validating JSON payloads against OCN schemas
 and CloudEvents against their respective schemas.
 """
 
+import hashlib
 import json
+import logging
+import mmap
+import os
+import sys
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
-from jsonschema import Draft202012Validator, ValidationError
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Mapping, Optional, Set, Tuple, Union
+from jsonschema import Draft202012Validator, SchemaError, ValidationError
 
+try:
+    import jsonschema_rs
+except ImportError:  # pragma: no cover - optional Rust-backed validator
+    jsonschema_rs = None  # type: ignore[assignment]
+
+try:
+    import fastjsonschema
+except ImportError:  # pragma: no cover - optional code-generating validator
+    fastjsonschema = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional fast JSON parser
+    orjson = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
 
 # Constants
 CONTENT_TYPE = "application/vnd.ocn.ap2+json; version=1"
 SCHEMA_VERSION = "v1"
 
+# Schema types, interned so cache keys built from them share cached hashes
+_MANDATES = sys.intern("mandates")
+_EVENTS = sys.intern("events")
+
+# Cache key for schemas and validators: (schema_type, schema_name)
+_CacheKey = Tuple[str, str]
+
+# Environment variable selecting the validation backend ('py', 'rs' or 'codegen')
+BACKEND_ENV_VAR = "OCN_JSONSCHEMA_BACKEND"
+
+# Supported validation backends
+_BACKENDS = ("py", "rs", "codegen")
+
+# Environment variable enabling JSON Schema meta-validation when schemas are loaded
+CHECK_SCHEMA_ENV_VAR = "OCN_CHECK_SCHEMA"
+
+# JSON parser for schemas and payloads (orjson.JSONDecodeError subclasses json.JSONDecodeError)
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Schema files larger than this are memory-mapped instead of read into a bytes object
+_MMAP_THRESHOLD = 1024 * 1024
+
+# Maximum number of parsed string payloads kept when payload caching is enabled
+_PAYLOAD_CACHE_SIZE = 256
+
 
 class ContractValidationError(Exception):
     """Raised when contract validation fails."""
@@ -22,9 +70,54 @@ class ContractValidationError(Exception):
     pass
 
 
+def _read_json_file(path: Path) -> Any:
+    """Parse a JSON file, memory-mapping large files when orjson can parse the buffer directly."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if orjson is None or size <= _MMAP_THRESHOLD:
+            return _json_loads(f.read())
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+def _dir_mtime_ns(path: Path) -> int:
+    """Return a directory's modification time in nanoseconds, or 0 if it does not exist."""
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def _declared_ce_type(schema: Any) -> Optional[str]:
+    """Return the CloudEvent type pinned by an event schema's 'type' property, if any."""
+    # Boolean schemas (true/false) are valid JSON Schema too, at any level
+    properties = schema.get("properties") if isinstance(schema, dict) else None
+    type_schema = properties.get("type") if isinstance(properties, dict) else None
+    if not isinstance(type_schema, dict):
+        return None
+
+    if "const" in type_schema:
+        ce_type = type_schema["const"]
+    else:
+        enum = type_schema.get("enum")
+        ce_type = enum[0] if isinstance(enum, list) and len(enum) == 1 else None
+
+    return ce_type if isinstance(ce_type, str) else None
+
+
 class SchemaLoader:
     """Loads and caches JSON schemas from the common directory."""
 
+    __slots__ = (
+        "base_path",
+        "_schemas_cache",
+        "_ce_type_registry",
+        "_list_cache",
+        "_file_digests",
+        "_digest",
+    )
+
     def __init__(self, base_path: Optional[Path] = None):
         """
         Initialize schema loader.
@@ -39,23 +132,81 @@ class SchemaLoader:
             base_path = project_root
 
         self.base_path = base_path
-        self._schemas_cache: Dict[str, Dict[str, Any]] = {}
+        self._schemas_cache: Dict[_CacheKey, Dict[str, Any]] = {}
+        self._ce_type_registry: Optional[Dict[str, str]] = None
+        self._list_cache: Optional[Tuple[Tuple[int, int], Dict[str, Tuple[str, ...]]]] = None
+        self._file_digests, self._digest = self._compute_digests()
+
+    def _compute_digests(self) -> Tuple[Dict[_CacheKey, bytes], bytes]:
+        """
+        Hash every schema file.
+
+        Returns:
+            Per-schema BLAKE2b digests and a combined digest over all schema files
+            (names and contents, in sorted order)
+        """
+        file_digests: Dict[_CacheKey, bytes] = {}
+        combined = hashlib.blake2b(digest_size=16)
+        schema_dirs = (
+            (_MANDATES, self.base_path / "common" / "mandates"),
+            (_EVENTS, self.base_path / "common" / "events" / "v1"),
+        )
+        for schema_type, schema_dir in schema_dirs:
+            for schema_path in sorted(schema_dir.glob("*.schema.json")):
+                schema_name = sys.intern(schema_path.name.removesuffix(".schema.json"))
+                file_digest = hashlib.blake2b(schema_path.read_bytes(), digest_size=16).digest()
+                file_digests[(schema_type, schema_name)] = file_digest
+                combined.update(f"{schema_type}/{schema_name}\0".encode())
+                combined.update(file_digest)
+
+        return file_digests, combined.digest()
+
+    @property
+    def digest_hex(self) -> str:
+        """Fingerprint of all schema files, for comparing schema sets across processes."""
+        return self._digest.hex()
+
+    def reload(self) -> Set[_CacheKey]:
+        """
+        Re-read schema files, dropping cached schemas whose contents changed.
+
+        Unchanged schemas keep their parsed form, so a reload only pays for the
+        files that were actually modified, added or removed.
+
+        Returns:
+            (schema_type, schema_name) keys of schemas that changed
+        """
+        file_digests, self._digest = self._compute_digests()
+        changed = {
+            key
+            for key in file_digests.keys() | self._file_digests.keys()
+            if file_digests.get(key) != self._file_digests.get(key)
+        }
+        self._file_digests = file_digests
+
+        for key in changed:
+            self._schemas_cache.pop(key, None)
+        if changed:
+            self._list_cache = None
+            self._ce_type_registry = None
+
+        return changed
 
     def _load_schema(self, schema_path: Path) -> Dict[str, Any]:
         """Load a JSON schema from file."""
         try:
-            with open(schema_path, "r") as f:
-                schema = json.load(f)
+            schema = _read_json_file(schema_path)
 
-            # Validate that it's a valid JSON Schema
-            Draft202012Validator.check_schema(schema)
+            # Meta-validation is enforced by the test suite; only repeat it at runtime on request
+            if os.environ.get(CHECK_SCHEMA_ENV_VAR) == "1":
+                Draft202012Validator.check_schema(schema)
             return schema
-        except (json.JSONDecodeError, ValidationError) as e:
+        except (json.JSONDecodeError, SchemaError) as e:
             raise ContractValidationError(f"Invalid schema at {schema_path}: {e}")
         except FileNotFoundError:
             raise ContractValidationError(f"Schema not found at {schema_path}")
 
-    def get_schema(self, schema_name: str, schema_type: str = "mandates") -> Dict[str, Any]:
+    def get_schema(self, schema_name: str, schema_type: str = _MANDATES) -> Dict[str, Any]:
         """
         Get a cached schema by name and type.
 
@@ -66,65 +217,328 @@ class SchemaLoader:
         Returns:
             The JSON schema dictionary
         """
-        cache_key = f"{schema_type}/{schema_name}"
+        cache_key = (schema_type, schema_name)
 
         if cache_key not in self._schemas_cache:
-            if schema_type == "mandates":
+            if schema_type == _MANDATES:
                 schema_path = self.base_path / "common" / "mandates" / f"{schema_name}.schema.json"
-            elif schema_type == "events":
+            elif schema_type == _EVENTS:
                 schema_path = (
                     self.base_path / "common" / "events" / "v1" / f"{schema_name}.schema.json"
                 )
             else:
                 raise ContractValidationError(f"Unknown schema type: {schema_type}")
 
+            cache_key = (sys.intern(schema_type), sys.intern(schema_name))
             self._schemas_cache[cache_key] = self._load_schema(schema_path)
 
         return self._schemas_cache[cache_key]
 
-    def list_available_schemas(self) -> Dict[str, list]:
-        """List all available schemas by type."""
-        schemas: Dict[str, list] = {"mandates": [], "events": []}
+    def list_available_schemas(self) -> Dict[str, Tuple[str, ...]]:
+        """
+        List all available schemas by type.
 
-        # List mandate schemas
+        The listing is cached and rebuilt only when the modification time of a
+        schema directory changes (i.e. schema files were added, removed or renamed).
+        Rebuilding also parses every event schema to refresh the CloudEvent type
+        registry; event schemas that cannot be parsed are still listed but are left
+        out of the registry, so one broken file does not make listing fail.
+        """
         mandates_path = self.base_path / "common" / "mandates"
-        if mandates_path.exists():
-            for schema_file in mandates_path.glob("*.schema.json"):
-                schemas["mandates"].append(schema_file.stem)
-
-        # List event schemas
         events_path = self.base_path / "common" / "events" / "v1"
-        if events_path.exists():
-            for schema_file in events_path.glob("*.schema.json"):
-                schemas["events"].append(schema_file.stem)
+        mtimes = (_dir_mtime_ns(mandates_path), _dir_mtime_ns(events_path))
+        if self._list_cache is not None and self._list_cache[0] == mtimes:
+            return dict(self._list_cache[1])
+
+        # List mandate schemas (an mtime of 0 means the directory does not exist)
+        mandates = []
+        if mtimes[0]:
+            for schema_file in sorted(mandates_path.glob("*.schema.json")):
+                mandates.append(schema_file.stem)
+
+        # List event schemas and register the CloudEvent type each one declares
+        events = []
+        ce_type_registry: Dict[str, str] = {}
+        if mtimes[1]:
+            # Sorted, so that of two schemas declaring the same type the first by name wins
+            for schema_file in sorted(events_path.glob("*.schema.json")):
+                events.append(schema_file.stem)
+
+                schema_name = schema_file.stem.removesuffix(".schema")
+                try:
+                    schema = self.get_schema(schema_name, _EVENTS)
+                except ContractValidationError:
+                    continue
+                ce_type = _declared_ce_type(schema)
+                if ce_type is None:
+                    continue
+                if ce_type in ce_type_registry:
+                    logger.warning(
+                        "CloudEvent type %r is declared by both %r and %r; using %r",
+                        ce_type,
+                        ce_type_registry[ce_type],
+                        schema_name,
+                        ce_type_registry[ce_type],
+                    )
+                    continue
+                ce_type_registry[ce_type] = schema_name
+
+        schemas = {_MANDATES: tuple(mandates), _EVENTS: tuple(events)}
+        self._ce_type_registry = ce_type_registry
+        self._list_cache = (mtimes, schemas)
+        return dict(schemas)
+
+    @property
+    def ce_type_registry(self) -> Dict[str, str]:
+        """Map of CloudEvent type names to event schema names, discovered from schema files."""
+        if self._ce_type_registry is None:
+            self.list_available_schemas()
+        # list_available_schemas() always sets the registry; the fallback is for type checkers
+        return self._ce_type_registry or {}
+
+
+class _RustValidator:
+    """
+    Adapter exposing the jsonschema validator interface over jsonschema_rs.
+
+    Errors are re-raised as jsonschema ValidationError instances so callers can
+    handle both backends identically.
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        """
+        Compile a schema with the Rust-backed validator.
+
+        Args:
+            schema: JSON schema dictionary
+
+        Raises:
+            SchemaError: If the schema itself is invalid
+        """
+        try:
+            self._validator = jsonschema_rs.Draft202012Validator(schema, validate_formats=False)
+        except jsonschema_rs.ValidationError as e:
+            raise SchemaError(str(e)) from None
+
+    @staticmethod
+    def _convert_error(error: Any) -> ValidationError:
+        """Convert a jsonschema_rs error into a jsonschema ValidationError."""
+        return ValidationError(
+            error.message, path=error.instance_path, schema_path=error.schema_path
+        )
+
+    def is_valid(self, payload: Any) -> bool:
+        """Return True if the payload is valid."""
+        return self._validator.is_valid(payload)
+
+    def validate(self, payload: Any) -> None:
+        """Validate the payload, raising ValidationError on the first failure."""
+        try:
+            self._validator.validate(payload)
+        except jsonschema_rs.ValidationError as e:
+            raise self._convert_error(e) from None
+
+    def iter_errors(self, payload: Any) -> Iterator[ValidationError]:
+        """Lazily yield all validation errors for the payload."""
+        for error in self._validator.iter_errors(payload):
+            yield self._convert_error(error)
+
+
+class _CodegenValidator:
+    """
+    Adapter exposing the jsonschema validator interface over fastjsonschema.
 
-        return schemas
+    fastjsonschema generates a specialized Python function for the schema once,
+    at compile time. It stops at the first failure, so iter_errors yields at most
+    one error.
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        """
+        Generate a validation function for a schema.
+
+        Args:
+            schema: JSON schema dictionary
+
+        Raises:
+            SchemaError: If the schema itself is invalid
+        """
+        # Defaults must not be written into payloads; formats are not asserted by
+        # the jsonschema backend either
+        try:
+            self._validate = fastjsonschema.compile(schema, use_default=False, use_formats=False)
+        except fastjsonschema.JsonSchemaDefinitionException as e:
+            raise SchemaError(str(e)) from None
+
+    @staticmethod
+    def _convert_error(error: Any) -> ValidationError:
+        """Convert a fastjsonschema error into a jsonschema ValidationError."""
+        # The first path element is fastjsonschema's name for the root ('data')
+        return ValidationError(
+            error.message,
+            path=error.path[1:],
+            schema_path=(error.rule,) if error.rule else (),
+        )
+
+    def is_valid(self, payload: Any) -> bool:
+        """Return True if the payload is valid."""
+        try:
+            self._validate(payload)
+        except fastjsonschema.JsonSchemaValueException:
+            return False
+        return True
+
+    def validate(self, payload: Any) -> None:
+        """Validate the payload, raising ValidationError on the first failure."""
+        try:
+            self._validate(payload)
+        except fastjsonschema.JsonSchemaValueException as e:
+            raise self._convert_error(e) from None
+
+    def iter_errors(self, payload: Any) -> Iterator[ValidationError]:
+        """Yield the first validation error for the payload, if any."""
+        try:
+            self._validate(payload)
+        except fastjsonschema.JsonSchemaValueException as e:
+            yield self._convert_error(e)
+
+
+_Validator = Union[Draft202012Validator, _RustValidator, _CodegenValidator]
 
 
 class ContractValidator:
     """Validates JSON payloads against OCN schemas."""
 
-    def __init__(self, schema_loader: Optional[SchemaLoader] = None):
+    __slots__ = ("backend", "schema_loader", "_validators_cache", "_payload_cache")
+
+    def __init__(
+        self,
+        schema_loader: Optional[SchemaLoader] = None,
+        backend: Optional[str] = None,
+        cache_payloads: bool = False,
+    ):
         """
         Initialize contract validator.
 
         Args:
             schema_loader: Schema loader instance. If None, creates a new one.
+            backend: Validation backend, 'py' (jsonschema), 'rs' (jsonschema_rs) or
+                'codegen' (fastjsonschema). If None, read from the OCN_JSONSCHEMA_BACKEND
+                environment variable, defaulting to 'py' (also used for unrecognized values).
+                Falls back to 'py' if the selected backend's package is not installed.
+            cache_payloads: Reuse parsed results for repeated JSON string payloads.
+                Only worthwhile when the same payload strings are validated repeatedly.
         """
+        if backend is None:
+            # The global validator is built at import, so a bad environment value must
+            # not raise; fall back to the default backend instead
+            backend = os.environ.get(BACKEND_ENV_VAR, "py").strip().lower()
+            if backend not in _BACKENDS:
+                backend = "py"
+        if backend not in _BACKENDS:
+            raise ContractValidationError(f"Unknown validation backend: {backend}")
+        if backend == "rs" and jsonschema_rs is None:
+            backend = "py"
+        if backend == "codegen" and fastjsonschema is None:
+            backend = "py"
+
+        self.backend = backend
         self.schema_loader = schema_loader or SchemaLoader()
-        self._validators_cache: Dict[str, Draft202012Validator] = {}
+        self._validators_cache: Mapping[_CacheKey, _Validator] = self._warmup()
+        self._payload_cache: Optional[Dict[bytes, Any]] = {} if cache_payloads else None
 
-    def _get_validator(
-        self, schema_name: str, schema_type: str = "mandates"
-    ) -> Draft202012Validator:
-        """Get a cached validator for a schema."""
-        cache_key = f"{schema_type}/{schema_name}"
+    def _compile(self, schema: Dict[str, Any], schema_name: str) -> _Validator:
+        """
+        Compile a validator for a schema using the selected backend.
+
+        Raises:
+            ContractValidationError: If the backend rejects the schema itself
+        """
+        try:
+            if self.backend == "rs":
+                return _RustValidator(schema)
+            if self.backend == "codegen":
+                return _CodegenValidator(schema)
+        except SchemaError as e:
+            raise ContractValidationError(
+                f"Invalid schema '{schema_name}' for the '{self.backend}' backend: {e}"
+            ) from None
+        return Draft202012Validator(schema)
 
-        if cache_key not in self._validators_cache:
+    def _warmup(
+        self, reuse: Mapping[_CacheKey, _Validator] = MappingProxyType({})
+    ) -> Mapping[_CacheKey, _Validator]:
+        """
+        Compile validators for all available schemas.
+
+        Compilation cost is paid once here rather than on the first request for
+        each schema. The returned cache is read-only. Schemas that fail to load or
+        compile are skipped, so the error surfaces when that schema is used rather than when
+        the validator (or, for the global validator, this module) is created.
+
+        Args:
+            reuse: Already compiled validators to keep instead of recompiling
+        """
+        cache: Dict[_CacheKey, _Validator] = {}
+        for schema_type, schema_files in self.schema_loader.list_available_schemas().items():
+            for schema_file in schema_files:
+                key = (schema_type, sys.intern(schema_file.removesuffix(".schema")))
+                validator = reuse.get(key)
+                if validator is None:
+                    try:
+                        schema = self.schema_loader.get_schema(key[1], schema_type)
+                        validator = self._compile(schema, key[1])
+                    except ContractValidationError:
+                        continue
+                cache[key] = validator
+
+        return MappingProxyType(cache)
+
+    def reload(self) -> Set[_CacheKey]:
+        """
+        Reload changed schema files and recompile only their validators.
+
+        Returns:
+            (schema_type, schema_name) keys of schemas that changed
+        """
+        changed = self.schema_loader.reload()
+        if changed:
+            reuse = {k: v for k, v in self._validators_cache.items() if k not in changed}
+            self._validators_cache = self._warmup(reuse)
+
+        return changed
+
+    def _parse_payload(self, payload: Union[Dict[str, Any], str]) -> Any:
+        """Parse a JSON string payload, reusing earlier results if payload caching is on."""
+        if not isinstance(payload, str):
+            return payload
+
+        if self._payload_cache is None:
+            return _json_loads(payload)
+
+        key = hashlib.blake2b(payload.encode(), digest_size=16).digest()
+        parsed = self._payload_cache.get(key)
+        if parsed is None:
+            parsed = _json_loads(payload)
+            if len(self._payload_cache) >= _PAYLOAD_CACHE_SIZE:
+                # Evict the oldest entry
+                self._payload_cache.pop(next(iter(self._payload_cache)), None)
+            self._payload_cache[key] = parsed
+
+        return parsed
+
+    def _get_validator(self, schema_name: str, schema_type: str = _MANDATES) -> _Validator:
+        """Get a cached validator for a schema."""
+        validator = self._validators_cache.get((schema_type, schema_name))
+        if validator is None:
+            # Schema was not present at warmup; compile it once and publish a new
+            # read-only cache that includes it (rare, so the copy is cheap overall)
             schema = self.schema_loader.get_schema(schema_name, schema_type)
-            self._validators_cache[cache_key] = Draft202012Validator(schema)
+            validator = self._compile(schema, schema_name)
+            key = (sys.intern(schema_type), sys.intern(schema_name))
+            self._validators_cache = MappingProxyType({**self._validators_cache, key: validator})
 
-        return self._validators_cache[cache_key]
+        return validator
 
     def validate_json(self, payload: Union[Dict[str, Any], str], schema_name: str) -> bool:
         """
@@ -141,11 +555,13 @@ class ContractValidator:
             ContractValidationError: If validation fails
         """
         try:
-            # Parse payload if it's a string
-            if isinstance(payload, str):
-                payload = json.loads(payload)
+            payload = self._parse_payload(payload)
+
+            validator = self._get_validator(schema_name, _MANDATES)
+            if validator.is_valid(payload):
+                return True
 
-            validator = self._get_validator(schema_name, "mandates")
+            # Only build the error (best match) once validation is known to fail
             validator.validate(payload)
             return True
 
@@ -173,26 +589,22 @@ class ContractValidator:
             ContractValidationError: If validation fails
         """
         try:
-            # Parse payload if it's a string
-            if isinstance(payload, str):
-                payload = json.loads(payload)
-
-            # Map type names to schema names
-            type_to_schema = {
-                "ocn.orca.decision.v1": "orca.decision.v1",
-                "ocn.orca.explanation.v1": "orca.explanation.v1",
-                "ocn.weave.audit.v1": "weave.audit.v1",
-                # Phase 2 event types
-                "ocn.orion.explanation.v1": "orion.explanation.v1",
-                "ocn.okra.bnpl_quote.v1": "okra.bnpl_quote.v1",
-                "ocn.onyx.kyb_verified.v1": "onyx.kyb_verified.v1",
-            }
-
-            schema_name = type_to_schema.get(type_name)
+            payload = self._parse_payload(payload)
+
+            schema_name = self.schema_loader.ce_type_registry.get(type_name)
+            if not schema_name:
+                # An event schema may have been added since the registry was built; the
+                # listing is only rebuilt if a schema directory's mtime changed
+                self.schema_loader.list_available_schemas()
+                schema_name = self.schema_loader.ce_type_registry.get(type_name)
             if not schema_name:
                 raise ContractValidationError(f"Unknown CloudEvent type: {type_name}")
 
-            validator = self._get_validator(schema_name, "events")
+            validator = self._get_validator(schema_name, _EVENTS)
+            if validator.is_valid(payload):
+                return True
+
+            # Only build the error (best match) once validation is known to fail
             validator.validate(payload)
             return True
 
@@ -206,7 +618,11 @@ class ContractValidator:
             raise ContractValidationError(f"Unexpected validation error: {e}")
 
     def get_validation_errors(
-        self, payload: Union[Dict[str, Any], str], schema_name: str, schema_type: str = "mandates"
+        self,
+        payload: Union[Dict[str, Any], str],
+        schema_name: str,
+        schema_type: str = _MANDATES,
+        max_errors: Optional[int] = 50,
     ) -> list:
         """
         Get detailed validation errors for a payload.
@@ -215,24 +631,33 @@ class ContractValidator:
             payload: JSON payload to validate (dict or JSON string)
             schema_name: Name of the schema
             schema_type: Type of schema ('mandates' or 'events')
+            max_errors: Maximum number of errors to collect (at least 1), or None for all
 
         Returns:
             List of validation error messages
+
+        Raises:
+            ValueError: If max_errors is less than 1
         """
+        if max_errors is not None and max_errors < 1:
+            raise ValueError(f"max_errors must be at least 1 or None, got {max_errors}")
+
         try:
-            # Parse payload if it's a string
-            if isinstance(payload, str):
-                payload = json.loads(payload)
+            payload = self._parse_payload(payload)
 
             validator = self._get_validator(schema_name, schema_type)
+            if validator.is_valid(payload):
+                return []
+
+            join = ".".join
             errors = []
 
-            for error in validator.iter_errors(payload):
+            for error in islice(validator.iter_errors(payload), max_errors):
                 errors.append(
                     {
-                        "path": ".".join(str(p) for p in error.path),
+                        "path": join(map(str, error.path)),
                         "message": error.message,
-                        "schema_path": ".".join(str(p) for p in error.schema_path),
+                        "schema_path": join(map(str, error.schema_path)),
                     }
                 )
 
@@ -244,15 +669,12 @@ class ContractValidator:
             return [{"path": "", "message": f"Validation error: {e}", "schema_path": ""}]
 
 
-# Global validator instance
-_global_validator: Optional[ContractValidator] = None
+# Global validator instance, warmed up at import
+_global_validator = ContractValidator()
 
 
 def get_contract_validator() -> ContractValidator:
     """Get the global contract validator instance."""
-    global _global_validator
-    if _global_validator is None:
-        _global_validator = ContractValidator()
     return _global_validator
 
 
@@ -296,7 +718,7 @@ def validate_cloudevent(payload: Union[Dict[str, Any], str], type_name: str) ->
     return validator.validate_cloudevent(payload, type_name)
 
 
-def list_available_schemas() -> Dict[str, list]:
+def list_available_schemas() -> Dict[str, Tuple[str, ...]]:
     """List all available schemas by type."""
     validator = get_contract_validator()
     return validator.schema_loader.list_available_schemas()
@@ -306,6 +728,8 @@ def list_available_schemas() -> Dict[str, list]:
 __all__ = [
     "CONTENT_TYPE",
     "SCHEMA_VERSION",
+    "BACKEND_ENV_VAR",
+    "CHECK_SCHEMA_ENV_VAR",
     "ContractValidationError",
     "ContractValidator",
     "SchemaLoader",
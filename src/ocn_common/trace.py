@@ -5,9 +5,15 @@ This module provides trace ID generation and management utilities that can be
 used across all OCN services to maintain request correlation and observability.
 """
 
-import uuid
-from contextvars import ContextVar
-from typing import Any, Dict, Optional
+import binascii
+import logging
+import os
+import re
+import threading
+from collections.abc import Mapping
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 # Context variable for storing trace ID in the current execution context
 trace_context: ContextVar[Optional[str]] = ContextVar("trace_id", default=None)
@@ -15,6 +21,45 @@ trace_context: ContextVar[Optional[str]] = ContextVar("trace_id", default=None)
 # HTTP header name for trace ID propagation
 TRACE_HEADER = "x-ocn-trace-id"
 
+# ASGI form of TRACE_HEADER: header names arrive as lowercase bytes
+_TRACE_HEADER_BYTES = TRACE_HEADER.encode("ascii")
+
+# Canonical hyphenated UUID4 (version nibble 4, RFC 4122 variant)
+_UUID4_RE = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}", re.IGNORECASE
+)
+
+# byte -> byte with the UUID4 version nibble / RFC 4122 variant bits set, for bytes.translate
+_UUID4_VERSION_TABLE = bytes((b & 0x0F) | 0x40 for b in range(256))
+_UUID4_VARIANT_TABLE = bytes((b & 0x3F) | 0x80 for b in range(256))
+
+# Offset of each of the 32 hex digits of a UUID within its hyphenated 36-character form
+_UUID4_HEX_COLUMNS = tuple(i + (i >= 8) + (i >= 12) + (i >= 16) + (i >= 20) for i in range(32))
+
+# Trace IDs are generated this many at a time and handed out one by one
+_TRACE_ID_BATCH_SIZE = 128
+
+
+class _TraceIdPool(threading.local):
+    """Per-thread stack of pregenerated trace IDs."""
+
+    def __init__(self) -> None:
+        self.ids: List[str] = []
+
+
+# Each thread draws from its own pool, so concurrent callers never share state
+_trace_id_pool = _TraceIdPool()
+
+
+def _reset_trace_id_pool() -> None:
+    """Discard pregenerated IDs so a forked child never reuses its parent's."""
+    global _trace_id_pool
+    _trace_id_pool = _TraceIdPool()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_trace_id_pool)
+
 
 def new_trace_id() -> str:
     """
@@ -30,18 +75,102 @@ def new_trace_id() -> str:
         >>> trace_id.count('-') == 4  # UUID4 has 4 hyphens
         True
     """
-    return str(uuid.uuid4())
+    pool = _trace_id_pool
+    if not pool.ids:
+        pool.ids = new_trace_ids(_TRACE_ID_BATCH_SIZE)
+    return pool.ids.pop()
 
 
-def ensure_trace_id(ctx: Optional[Dict[str, Any]]) -> str:
+def new_trace_ids(n: int) -> List[str]:
+    """
+    Generate n unique trace IDs at once.
+
+    Reads all the randomness in a single call and formats it in bulk, which is
+    considerably faster than calling new_trace_id() n times.
+
+    Args:
+        n: Number of trace IDs to generate
+
+    Returns:
+        List of n UUID4 strings formatted as trace IDs.
+
+    Examples:
+        >>> trace_ids = new_trace_ids(3)
+        >>> len(trace_ids)
+        3
+        >>> len(set(trace_ids))
+        3
+    """
+    raw = bytearray(os.urandom(16 * n))
+    raw[6::16] = raw[6::16].translate(_UUID4_VERSION_TABLE)
+    raw[8::16] = raw[8::16].translate(_UUID4_VARIANT_TABLE)
+    hex_digits = binascii.hexlify(raw)
+
+    # Lay the IDs out as space-separated 36-character rows, copying one hex digit
+    # column at a time so the per-ID work happens in C rather than in a Python loop
+    out = bytearray(b"-" * (37 * n))
+    for i, column in enumerate(_UUID4_HEX_COLUMNS):
+        out[column::37] = hex_digits[i::32]
+    out[36::37] = b" " * n
+    return out.decode("ascii").split()
+
+
+@dataclass(slots=True, eq=False)
+class TraceCtx(Mapping):
+    """
+    Trace context for logging and correlation.
+
+    Fields are plain attributes, which are cheaper to read than dict keys. The
+    class also implements the read-only Mapping interface, so reading code written
+    for the dict form (``ctx["trace_id"]``, ``"trace_id" in ctx``, ``dict(ctx)``)
+    keeps working, and it compares equal to a dict with the same items. It is not
+    a dict: adding keys, ``copy()``/``update()`` and ``json.dumps`` need as_dict().
+
+    Attributes:
+        trace_id: Trace ID, or None if not assigned yet
+        service: Name of the service the context belongs to
+        version: Version of that service
+    """
+
+    trace_id: Optional[str] = None
+    service: str = "ocn-common"
+    version: str = "1.0.0"
+
+    def __getitem__(self, key: str) -> Optional[str]:
+        if key not in _TRACE_CTX_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_TRACE_CTX_FIELDS)
+
+    def __len__(self) -> int:
+        return len(_TRACE_CTX_FIELDS)
+
+    def as_dict(self) -> Dict[str, Optional[str]]:
+        """
+        Return the context as a new, mutable dictionary.
+
+        Use this where the previous dict return value of create_trace_context()
+        was mutated, copied or serialized (e.g. with json.dumps).
+        """
+        return {name: getattr(self, name) for name in _TRACE_CTX_FIELDS}
+
+
+# Field names of TraceCtx, in declaration order
+_TRACE_CTX_FIELDS = tuple(f.name for f in fields(TraceCtx))
+
+
+def ensure_trace_id(ctx: Union[TraceCtx, Dict[str, Any], None]) -> str:
     """
     Ensure a trace ID exists in the given context.
 
     If the context contains a valid trace ID (UUID4 format), return it.
-    Otherwise, generate a new one and store it in the context under the 'trace_id' key.
+    Otherwise, generate a new one and store it in the context: as the trace_id
+    attribute of a TraceCtx, or under the 'trace_id' key of a dictionary.
 
     Args:
-        ctx: Optional context dictionary that may contain a trace_id
+        ctx: Optional TraceCtx or context dictionary that may contain a trace_id
 
     Returns:
         The existing or newly created trace ID.
@@ -60,43 +189,41 @@ def ensure_trace_id(ctx: Optional[Dict[str, Any]]) -> str:
         True
     """
     if ctx is None:
-        ctx = {}
+        return new_trace_id()
 
-    # Check if we have a valid trace ID (UUID4 format)
-    existing_trace_id = ctx.get("trace_id")
-    if not existing_trace_id or not _is_valid_trace_id(existing_trace_id):
-        ctx["trace_id"] = new_trace_id()
+    # Keep the existing trace ID only if it is a canonical UUID4 string
+    if isinstance(ctx, TraceCtx):
+        trace_id = ctx.trace_id
+        if isinstance(trace_id, str) and _UUID4_RE.fullmatch(trace_id):
+            return trace_id
+        trace_id = ctx.trace_id = new_trace_id()
+        return trace_id
 
-    return ctx["trace_id"]
+    trace_id = ctx.get("trace_id")
+    if isinstance(trace_id, str) and _UUID4_RE.fullmatch(trace_id):
+        return trace_id
 
+    trace_id = ctx["trace_id"] = new_trace_id()
+    return trace_id
 
-def _is_valid_trace_id(trace_id: str) -> bool:
-    """
-    Check if a string is a valid UUID4 trace ID.
-
-    Args:
-        trace_id: String to validate
 
-    Returns:
-        True if valid UUID4 format, False otherwise
-    """
-    try:
-        parsed_uuid = uuid.UUID(trace_id)
-        return parsed_uuid.version == 4
-    except (ValueError, TypeError):
-        return False
-
-
-def inject_trace_id_ce(envelope: Dict[str, Any], trace_id: str) -> Dict[str, Any]:
+def inject_trace_id_ce(
+    envelope: Dict[str, Any], trace_id: str, *, inplace: bool = False
+) -> Dict[str, Any]:
     """
     Inject trace ID into a CloudEvent envelope as the subject.
 
     The CloudEvent subject field is used to carry the trace ID for correlation
     across services in the OCN ecosystem.
 
+    Only the top-level envelope is copied; nested values such as ``data`` are
+    shared with the original and must not be mutated through the result.
+
     Args:
         envelope: CloudEvent envelope dictionary
         trace_id: Trace ID to inject as the subject
+        inplace: Set the subject on the given envelope instead of a copy. Use only
+            when the caller owns the envelope.
 
     Returns:
         Modified CloudEvent envelope with trace_id as subject
@@ -115,6 +242,10 @@ def inject_trace_id_ce(envelope: Dict[str, Any], trace_id: str) -> Dict[str, Any
         >>> result['id'] == 'event-123'  # Other fields preserved
         True
     """
+    if inplace:
+        envelope["subject"] = trace_id
+        return envelope
+
     # Create a copy to avoid modifying the original
     modified_envelope = envelope.copy()
     modified_envelope["subject"] = trace_id
@@ -141,45 +272,113 @@ def get_current_trace_id() -> Optional[str]:
     return trace_context.get()
 
 
-def set_current_trace_id(trace_id: str) -> None:
+def set_current_trace_id(trace_id: Optional[str]) -> Token:
     """
     Set the current trace ID in the context variable.
 
     Args:
         trace_id: Trace ID to set in the current context
 
+    Returns:
+        Token that restores the previous trace ID when passed to clear_current_trace_id()
+
     Examples:
-        >>> set_current_trace_id('new-trace-456')
+        >>> token = set_current_trace_id('new-trace-456')
         >>> get_current_trace_id() == 'new-trace-456'
         True
+        >>> clear_current_trace_id(token)
     """
-    trace_context.set(trace_id)
+    return trace_context.set(trace_id)
 
 
-def clear_current_trace_id() -> None:
+def clear_current_trace_id(token: Optional[Token] = None) -> None:
     """
     Clear the current trace ID from the context variable.
 
+    Prefer passing the token returned by set_current_trace_id(): resetting restores
+    the trace ID that was current before, which keeps nested scopes (background
+    tasks, nested middleware) intact. Without a token the trace ID is set to None.
+
+    Args:
+        token: Token returned by set_current_trace_id()
+
     Examples:
-        >>> set_current_trace_id('trace-789')
-        >>> clear_current_trace_id()
+        >>> token = set_current_trace_id('trace-789')
+        >>> clear_current_trace_id(token)
         >>> get_current_trace_id() is None
         True
     """
-    trace_context.set(None)
+    if token is not None:
+        trace_context.reset(token)
+    else:
+        trace_context.set(None)
+
+
+class TraceMiddleware:
+    """
+    ASGI middleware for automatic trace ID management.
+
+    Implemented directly against the ASGI interface rather than Starlette's
+    BaseHTTPMiddleware, so requests are not wrapped in an extra task and
+    response stream.
+
+    For every HTTP request this middleware:
+    1. Extracts trace ID from the x-ocn-trace-id header (generating one if missing)
+    2. Sets it in the context variable for the duration of the request
+    3. Adds it to the x-ocn-trace-id response header
+    """
+
+    def __init__(self, app: Any):
+        """
+        Wrap an ASGI application.
+
+        Args:
+            app: ASGI application to wrap
+        """
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace_id = None
+        for name, value in scope["headers"]:
+            if name == _TRACE_HEADER_BYTES:
+                trace_id = value.decode("latin-1")
+                break
+        trace_id = trace_id or new_trace_id()
+        trace_header = (_TRACE_HEADER_BYTES, trace_id.encode("latin-1"))
+
+        async def send_with_trace_id(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                # Add trace ID to response headers for client correlation
+                response_headers = [
+                    header for header in message.get("headers", []) if header[0] != trace_header[0]
+                ]
+                response_headers.append(trace_header)
+                message = {**message, "headers": response_headers}
+            await send(message)
+
+        token = trace_context.set(trace_id)
+        try:
+            await self.app(scope, receive, send_with_trace_id)
+        finally:
+            # Restore whatever trace ID was current before this request
+            trace_context.reset(token)
 
 
 def trace_middleware(app):
     """
     FastAPI middleware helper for automatic trace ID management.
 
-    This middleware automatically:
+    Registers TraceMiddleware on the application, which automatically:
     1. Extracts trace ID from the x-ocn-trace-id header
     2. Sets it in the context variable for the request
     3. Ensures every request has a trace ID (generates one if missing)
 
     Args:
-        app: FastAPI application instance
+        app: FastAPI (or Starlette) application instance
 
     Returns:
         The same FastAPI app instance (for chaining)
@@ -195,54 +394,19 @@ def trace_middleware(app):
         propagation across all endpoints. The trace ID will be available
         via get_current_trace_id() in your route handlers.
     """
-    try:
-        from fastapi import Request
-        from starlette.middleware.base import BaseHTTPMiddleware
-
-        class TraceMiddleware(BaseHTTPMiddleware):
-            async def dispatch(self, request: Request, call_next):
-                # Extract trace ID from header
-                trace_id = request.headers.get(TRACE_HEADER)
-
-                # If no trace ID in header, generate a new one
-                if not trace_id:
-                    trace_id = new_trace_id()
-
-                # Set trace ID in context
-                set_current_trace_id(trace_id)
-
-                try:
-                    # Process the request
-                    response = await call_next(request)
-
-                    # Add trace ID to response headers for client correlation
-                    response.headers[TRACE_HEADER] = trace_id
-
-                    return response
-                finally:
-                    # Clean up context
-                    clear_current_trace_id()
-
-        # Add the middleware to the app
-        app.add_middleware(TraceMiddleware)
-
-    except ImportError:
-        # FastAPI not available - just return the app unchanged
-        # This allows the function to work in environments without FastAPI
-        pass
-
+    app.add_middleware(TraceMiddleware)
     return app
 
 
-def create_trace_context(trace_id: Optional[str] = None) -> Dict[str, str]:
+def create_trace_context(trace_id: Optional[str] = None) -> TraceCtx:
     """
-    Create a trace context dictionary for logging and correlation.
+    Create a trace context for logging and correlation.
 
     Args:
         trace_id: Optional trace ID, generates new one if not provided
 
     Returns:
-        Dictionary with trace_id and other context information
+        TraceCtx with trace_id and other context information
 
     Examples:
         >>> ctx = create_trace_context()
@@ -258,13 +422,16 @@ def create_trace_context(trace_id: Optional[str] = None) -> Dict[str, str]:
     if trace_id is None:
         trace_id = new_trace_id()
 
-    return {"trace_id": trace_id, "service": "ocn-common", "version": "1.0.0"}
+    return TraceCtx(trace_id)
 
 
 def format_trace_log(trace_id: str, message: str, **kwargs) -> str:
     """
     Format a log message with trace ID for structured logging.
 
+    Deprecated: prefer log_trace(), which hands the trace ID and context to the
+    logger as record attributes instead of flattening them into the message.
+
     Args:
         trace_id: Trace ID for correlation
         message: Log message
@@ -282,7 +449,35 @@ def format_trace_log(trace_id: str, message: str, **kwargs) -> str:
         >>> 'user_id=456' in log
         True
     """
-    context_parts = [f"{k}={v}" for k, v in kwargs.items()]
-    context_str = " ".join(context_parts) if context_parts else ""
+    if not kwargs:
+        return f"[trace_id={trace_id}] {message}"
+
+    # A list comprehension is faster than a generator here: str.join materializes it anyway
+    context_str = " ".join([f"{k}={v}" for k, v in kwargs.items()])
+    return f"[trace_id={trace_id}] {message} {context_str}"
+
 
-    return f"[trace_id={trace_id}] {message}" + (f" {context_str}" if context_str else "")
+def log_trace(
+    logger: logging.Logger, level: int, trace_id: str, message: str, **kwargs: Any
+) -> None:
+    """
+    Log a message with trace ID and context attached as structured fields.
+
+    The trace ID and every keyword argument become attributes of the LogRecord
+    (via ``extra``), so structured formatters can serialize them directly rather
+    than parsing them back out of the message text.
+
+    Args:
+        logger: Logger to emit the record on
+        level: Logging level, e.g. logging.INFO
+        trace_id: Trace ID for correlation
+        message: Log message
+        **kwargs: Additional context; names must not clash with LogRecord attributes
+
+    Examples:
+        >>> import logging
+        >>> log_trace(logging.getLogger(__name__), logging.INFO, 'trace-123', 'Done', user_id='456')
+    """
+    if logger.isEnabledFor(level):
+        # stacklevel=2 attributes the record (pathname, lineno, funcName) to the caller
+        logger.log(level, message, extra={"trace_id": trace_id, **kwargs}, stacklevel=2)
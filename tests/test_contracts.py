@@ -3,12 +3,19 @@ Tests for OCN Common Contracts validation.
 """
 
 import json
+import os
+import shutil
+import subprocess
+import sys
 import pytest
 from pathlib import Path
+from jsonschema import Draft202012Validator
 
+from ocn_common import contracts
 from ocn_common.contracts import (
     ContractValidator,
     ContractValidationError,
+    SchemaLoader,
     validate_json,
     validate_cloudevent,
     get_contract_validator,
@@ -65,6 +72,136 @@ class TestSchemaLoader:
         for event in expected_events:
             assert event in schemas["events"]
 
+    def test_shipped_schemas_are_valid(self):
+        """Test that every shipped schema is a valid JSON Schema."""
+        loader = SchemaLoader()
+        for schema_type, schema_files in loader.list_available_schemas().items():
+            for schema_file in schema_files:
+                schema = loader.get_schema(schema_file.removesuffix(".schema"), schema_type)
+                Draft202012Validator.check_schema(schema)
+
+    def test_check_schema_opt_in(self, tmp_path, monkeypatch):
+        """Test that runtime meta-validation only runs when OCN_CHECK_SCHEMA=1."""
+        mandates_dir = tmp_path / "common" / "mandates"
+        mandates_dir.mkdir(parents=True)
+        (mandates_dir / "broken.schema.json").write_text(json.dumps({"type": 12}))
+
+        monkeypatch.delenv("OCN_CHECK_SCHEMA", raising=False)
+        assert SchemaLoader(tmp_path).get_schema("broken") == {"type": 12}
+
+        monkeypatch.setenv("OCN_CHECK_SCHEMA", "1")
+        with pytest.raises(ContractValidationError):
+            SchemaLoader(tmp_path).get_schema("broken")
+
+    def test_list_available_schemas_cached(self, tmp_path, monkeypatch):
+        """Test that listings are reused until a schema directory changes."""
+        mandates_dir = tmp_path / "common" / "mandates"
+        mandates_dir.mkdir(parents=True)
+        (mandates_dir / "first.schema.json").write_text("{}")
+        loader = SchemaLoader(tmp_path)
+        assert loader.list_available_schemas()["mandates"] == ("first.schema",)
+
+        globbed = []
+        original_glob = Path.glob
+        monkeypatch.setattr(
+            Path, "glob", lambda *args: globbed.append(args) or original_glob(*args)
+        )
+        assert loader.list_available_schemas()["mandates"] == ("first.schema",)
+        assert globbed == []
+
+        (mandates_dir / "second.schema.json").write_text("{}")
+        os.utime(mandates_dir, ns=(0, 1))
+        assert sorted(loader.list_available_schemas()["mandates"]) == [
+            "first.schema",
+            "second.schema",
+        ]
+
+    @pytest.mark.skipif(contracts.orjson is None, reason="orjson not installed")
+    def test_load_large_schema_memory_mapped(self, monkeypatch):
+        """Test that schemas above the mmap threshold load identically."""
+        loader = SchemaLoader()
+        expected = loader.get_schema("intent_mandate")
+
+        monkeypatch.setattr(contracts, "_MMAP_THRESHOLD", 0)
+        assert SchemaLoader().get_schema("intent_mandate") == expected
+
+    def test_ce_type_registry(self):
+        """Test that CloudEvent types are discovered from event schemas."""
+        registry = SchemaLoader().ce_type_registry
+        assert registry["ocn.orca.decision.v1"] == "orca.decision.v1"
+        assert registry["ocn.weave.audit.v1"] == "weave.audit.v1"
+        assert registry["ocn.onyx.kyb_verified.v1"] == "onyx.kyb_verified.v1"
+
+    def test_ce_type_registry_new_schema(self, tmp_path):
+        """Test that a new event schema file is picked up without code changes."""
+        events_dir = tmp_path / "common" / "events" / "v1"
+        events_dir.mkdir(parents=True)
+        schema = {
+            "type": "object",
+            "required": ["type"],
+            "properties": {"type": {"const": "ocn.test.ping.v1"}},
+        }
+        (events_dir / "test.ping.v1.schema.json").write_text(json.dumps(schema))
+
+        validator = ContractValidator(SchemaLoader(tmp_path))
+        assert validator.validate_cloudevent({"type": "ocn.test.ping.v1"}, "ocn.test.ping.v1")
+        with pytest.raises(ContractValidationError):
+            validator.validate_cloudevent({"type": "other"}, "ocn.test.ping.v1")
+
+    def test_ce_type_registry_schema_added_after_init(self, tmp_path):
+        """Test that an event schema added after construction is found on first use."""
+        events_dir = tmp_path / "common" / "events" / "v1"
+        events_dir.mkdir(parents=True)
+        validator = ContractValidator(SchemaLoader(tmp_path))
+        with pytest.raises(ContractValidationError, match="Unknown CloudEvent type"):
+            validator.validate_cloudevent({"type": "ocn.test.ping.v1"}, "ocn.test.ping.v1")
+
+        schema = {"type": "object", "properties": {"type": {"const": "ocn.test.ping.v1"}}}
+        (events_dir / "test.ping.v1.schema.json").write_text(json.dumps(schema))
+        assert validator.validate_cloudevent({"type": "ocn.test.ping.v1"}, "ocn.test.ping.v1")
+
+    def test_ce_type_registry_skips_unparsable_schema(self, tmp_path):
+        """Test that one broken event schema does not break listing or the registry."""
+        events_dir = tmp_path / "common" / "events" / "v1"
+        events_dir.mkdir(parents=True)
+        schema = {"type": "object", "properties": {"type": {"const": "ocn.test.ping.v1"}}}
+        (events_dir / "test.ping.v1.schema.json").write_text(json.dumps(schema))
+        (events_dir / "test.broken.v1.schema.json").write_text("{not json")
+
+        loader = SchemaLoader(tmp_path)
+        assert sorted(loader.list_available_schemas()["events"]) == [
+            "test.broken.v1.schema",
+            "test.ping.v1.schema",
+        ]
+        assert loader.ce_type_registry == {"ocn.test.ping.v1": "test.ping.v1"}
+        ContractValidator(loader)
+
+    def test_ce_type_registry_boolean_schemas(self, tmp_path):
+        """Test that boolean schemas, at the top level or for 'type', are not registered."""
+        events_dir = tmp_path / "common" / "events" / "v1"
+        events_dir.mkdir(parents=True)
+        (events_dir / "test.anything.v1.schema.json").write_text("true")
+        (events_dir / "test.loose.v1.schema.json").write_text(
+            json.dumps({"properties": {"type": True}})
+        )
+
+        loader = SchemaLoader(tmp_path)
+        assert len(loader.list_available_schemas()["events"]) == 2
+        assert loader.ce_type_registry == {}
+        ContractValidator(loader)
+
+    def test_ce_type_registry_duplicate_type(self, tmp_path, caplog):
+        """Test that the first schema by name wins when two declare the same type."""
+        events_dir = tmp_path / "common" / "events" / "v1"
+        events_dir.mkdir(parents=True)
+        schema = {"properties": {"type": {"const": "ocn.test.ping.v1"}}}
+        for name in ("test.b.v1", "test.a.v1"):
+            (events_dir / f"{name}.schema.json").write_text(json.dumps(schema))
+
+        loader = SchemaLoader(tmp_path)
+        assert loader.ce_type_registry == {"ocn.test.ping.v1": "test.a.v1"}
+        assert "declared by both 'test.a.v1' and 'test.b.v1'" in caplog.text
+
 
 class TestContractValidator:
     """Test contract validation functionality."""
@@ -97,7 +234,7 @@ class TestContractValidator:
             "metadata": {},
         }
 
-        with pytest.raises(ContractValidationError):
+        with pytest.raises(ContractValidationError, match="'intent_mandate'.*invalid_channel"):
             validator.validate_json(invalid_intent, "intent_mandate")
 
     def test_validate_json_valid_cart(self, validator):
@@ -223,6 +360,371 @@ class TestContractValidator:
         assert all("message" in error for error in errors)
         assert all("path" in error for error in errors)
 
+    def test_get_validation_errors_valid_payload(self, validator):
+        """Test that a valid payload yields no errors."""
+        intent_data = {
+            "actor": {"id": "user_123", "type": "user"},
+            "channel": "web",
+            "geo": {"country": "US"},
+            "metadata": {},
+        }
+
+        assert validator.get_validation_errors(intent_data, "intent_mandate") == []
+
+    def test_get_validation_errors_max_errors(self, validator):
+        """Test that error collection stops at max_errors."""
+        invalid_intent = {"actor": {"id": 1, "type": "robot"}, "channel": "invalid_channel"}
+
+        errors = validator.get_validation_errors(invalid_intent, "intent_mandate")
+        assert len(errors) > 1
+
+        errors = validator.get_validation_errors(invalid_intent, "intent_mandate", max_errors=1)
+        assert len(errors) == 1
+
+        all_errors = validator.get_validation_errors(
+            invalid_intent, "intent_mandate", max_errors=None
+        )
+        assert all_errors == validator.get_validation_errors(
+            invalid_intent, "intent_mandate", max_errors=1000
+        )
+
+    @pytest.mark.parametrize("max_errors", [0, -1])
+    def test_get_validation_errors_invalid_max_errors(self, validator, max_errors):
+        """Test that a max_errors below 1 is rejected rather than hiding errors."""
+        with pytest.raises(ValueError, match="max_errors"):
+            validator.get_validation_errors({}, "intent_mandate", max_errors=max_errors)
+
+
+class TestValidatorWarmup:
+    """Test eager validator compilation."""
+
+    def test_validators_compiled_at_init(self):
+        """Test that validators for all available schemas are compiled upfront."""
+        validator = ContractValidator()
+        assert ("mandates", "intent_mandate") in validator._validators_cache
+        assert ("events", "orca.decision.v1") in validator._validators_cache
+
+    def test_validators_cache_is_read_only(self):
+        """Test that the warmed-up validator cache cannot be mutated."""
+        validator = ContractValidator()
+        with pytest.raises(TypeError):
+            validator._validators_cache[("mandates", "extra")] = None
+
+    def test_schema_added_after_warmup(self, tmp_path):
+        """Test that schemas added after warmup are still usable."""
+        mandates_dir = tmp_path / "common" / "mandates"
+        mandates_dir.mkdir(parents=True)
+        validator = ContractValidator(SchemaLoader(tmp_path))
+        assert len(validator._validators_cache) == 0
+
+        schema = {"type": "object", "required": ["id"]}
+        (mandates_dir / "late.schema.json").write_text(json.dumps(schema))
+        assert validator.validate_json({"id": "1"}, "late") is True
+        with pytest.raises(ContractValidationError):
+            validator.validate_json({}, "late")
+
+        # Compiled once, then reused from the (still read-only) cache
+        assert validator._get_validator("late") is validator._get_validator("late")
+        assert ("mandates", "late") in validator._validators_cache
+        with pytest.raises(TypeError):
+            validator._validators_cache[("mandates", "extra")] = None
+
+    def test_unloadable_schema_skipped_at_warmup(self, tmp_path):
+        """Test that a broken schema fails when used, not when the validator is created."""
+        mandates_dir = tmp_path / "common" / "mandates"
+        mandates_dir.mkdir(parents=True)
+        (mandates_dir / "broken.schema.json").write_text("{not json")
+        (mandates_dir / "ok.schema.json").write_text(json.dumps({"type": "object"}))
+
+        validator = ContractValidator(SchemaLoader(tmp_path))
+
+        assert validator.validate_json({}, "ok") is True
+        with pytest.raises(ContractValidationError, match="Invalid schema"):
+            validator.validate_json({}, "broken")
+
+
+class TestPayloadCache:
+    """Test caching of parsed string payloads."""
+
+    INTENT_JSON = json.dumps(
+        {
+            "actor": {"id": "user_123", "type": "user"},
+            "channel": "web",
+            "geo": {"country": "US"},
+            "metadata": {},
+        }
+    )
+
+    def test_payload_cache_disabled_by_default(self):
+        """Test that string payloads are not cached by default."""
+        validator = ContractValidator()
+        assert validator.validate_json(self.INTENT_JSON, "intent_mandate") is True
+        assert validator._payload_cache is None
+
+    def test_payload_cache_reuses_parse(self, monkeypatch):
+        """Test that repeated string payloads are parsed once."""
+        calls = []
+        json_loads = contracts._json_loads
+
+        def counting_loads(data):
+            calls.append(data)
+            return json_loads(data)
+
+        validator = ContractValidator(cache_payloads=True)
+        monkeypatch.setattr(contracts, "_json_loads", counting_loads)
+
+        for _ in range(3):
+            assert validator.validate_json(self.INTENT_JSON, "intent_mandate") is True
+        assert len(calls) == 1
+
+    def test_payload_cache_is_bounded(self, monkeypatch):
+        """Test that the payload cache evicts old entries."""
+        monkeypatch.setattr(contracts, "_PAYLOAD_CACHE_SIZE", 2)
+        validator = ContractValidator(cache_payloads=True)
+
+        for i in range(5):
+            validator.get_validation_errors(json.dumps({"id": i}), "intent_mandate")
+        assert len(validator._payload_cache) == 2
+
+
+class TestSchemaReload:
+    """Test schema fingerprinting and incremental reloads."""
+
+    @pytest.fixture
+    def schema_dir(self, tmp_path):
+        """Create a schema directory with two mandate schemas."""
+        mandates_dir = tmp_path / "common" / "mandates"
+        mandates_dir.mkdir(parents=True)
+        (mandates_dir / "first.schema.json").write_text(json.dumps({"type": "object"}))
+        (mandates_dir / "second.schema.json").write_text(json.dumps({"type": "object"}))
+        return tmp_path
+
+    def test_digest_hex(self, schema_dir):
+        """Test that the digest depends only on schema file names and contents."""
+        digest = SchemaLoader(schema_dir).digest_hex
+        assert len(digest) == 32
+        assert SchemaLoader(schema_dir).digest_hex == digest
+
+        (schema_dir / "common" / "mandates" / "second.schema.json").write_text("{}")
+        assert SchemaLoader(schema_dir).digest_hex != digest
+
+    def test_reload_reparses_only_changed_schemas(self, schema_dir):
+        """Test that reload keeps parsed schemas whose files are unchanged."""
+        loader = SchemaLoader(schema_dir)
+        first = loader.get_schema("first")
+        loader.get_schema("second")
+        digest = loader.digest_hex
+
+        assert loader.reload() == set()
+        (schema_dir / "common" / "mandates" / "second.schema.json").write_text("{}")
+        assert loader.reload() == {("mandates", "second")}
+
+        assert loader.digest_hex != digest
+        assert loader.get_schema("first") is first
+        assert loader.get_schema("second") == {}
+
+    def test_validator_reload(self, schema_dir):
+        """Test that ContractValidator.reload recompiles only changed validators."""
+        validator = ContractValidator(SchemaLoader(schema_dir))
+        first_validator = validator._get_validator("first")
+        assert validator.validate_json({}, "second") is True
+
+        schema = {"type": "object", "required": ["id"]}
+        (schema_dir / "common" / "mandates" / "second.schema.json").write_text(json.dumps(schema))
+        assert validator.reload() == {("mandates", "second")}
+
+        assert validator._get_validator("first") is first_validator
+        with pytest.raises(ContractValidationError):
+            validator.validate_json({}, "second")
+
+
+class TestValidatorBackends:
+    """Test validation backend selection."""
+
+    def test_default_backend(self, monkeypatch):
+        """Test that the pure-Python backend is used by default."""
+        monkeypatch.delenv("OCN_JSONSCHEMA_BACKEND", raising=False)
+        validator = ContractValidator()
+        assert validator.backend == "py"
+
+    def test_backend_from_env(self, monkeypatch):
+        """Test selecting the backend via environment variable."""
+        monkeypatch.setenv("OCN_JSONSCHEMA_BACKEND", "rs")
+        validator = ContractValidator()
+        expected = "py" if contracts.jsonschema_rs is None else "rs"
+        assert validator.backend == expected
+
+    def test_rs_backend_falls_back_without_wheel(self, monkeypatch):
+        """Test fallback to the pure-Python backend when jsonschema_rs is missing."""
+        monkeypatch.setattr(contracts, "jsonschema_rs", None)
+        validator = ContractValidator(backend="rs")
+        assert validator.backend == "py"
+
+    def test_unknown_backend(self):
+        """Test that an unknown backend is rejected."""
+        with pytest.raises(ContractValidationError):
+            ContractValidator(backend="unknown")
+
+    def test_backend_env_normalized(self, monkeypatch):
+        """Test that the environment value is case- and whitespace-insensitive."""
+        monkeypatch.setenv("OCN_JSONSCHEMA_BACKEND", " RS ")
+        validator = ContractValidator()
+        expected = "py" if contracts.jsonschema_rs is None else "rs"
+        assert validator.backend == expected
+
+    def test_unknown_backend_env_falls_back(self, monkeypatch):
+        """Test that an unknown environment value falls back to the default backend."""
+        monkeypatch.setenv("OCN_JSONSCHEMA_BACKEND", "unknown")
+        validator = ContractValidator()
+        assert validator.backend == "py"
+
+    @staticmethod
+    def _import_contracts(backend, src_dir=None):
+        """Import ocn_common.contracts in a fresh interpreter, returning the process result."""
+        src_dir = src_dir or Path(contracts.__file__).parents[1]
+        env = dict(os.environ, OCN_JSONSCHEMA_BACKEND=backend)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(src_dir), env.get("PYTHONPATH")]))
+        return subprocess.run(
+            [sys.executable, "-c", "import ocn_common.contracts"],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+
+    def test_unknown_backend_env_does_not_break_import(self):
+        """Test that the module (and its global validator) imports with a bad env value."""
+        result = self._import_contracts("unknown")
+        assert result.returncode == 0, result.stderr
+
+    @pytest.mark.parametrize(
+        "backend",
+        [
+            pytest.param(
+                "rs",
+                marks=pytest.mark.skipif(
+                    contracts.jsonschema_rs is None, reason="jsonschema_rs not installed"
+                ),
+            ),
+            pytest.param(
+                "codegen",
+                marks=pytest.mark.skipif(
+                    contracts.fastjsonschema is None, reason="fastjsonschema not installed"
+                ),
+            ),
+        ],
+    )
+    def test_meta_invalid_schema_skipped_at_warmup(self, backend, tmp_path):
+        """Test that a schema the backend cannot compile fails on use, not on creation."""
+        mandates_dir = tmp_path / "common" / "mandates"
+        mandates_dir.mkdir(parents=True)
+        (mandates_dir / "broken.schema.json").write_text(json.dumps({"type": 12}))
+        (mandates_dir / "ok.schema.json").write_text(json.dumps({"type": "object"}))
+
+        validator = ContractValidator(SchemaLoader(tmp_path), backend=backend)
+
+        assert validator.validate_json({}, "ok") is True
+        with pytest.raises(ContractValidationError, match="Invalid schema 'broken'"):
+            validator.validate_json({}, "broken")
+
+        # The global validator is built at import, so the module must still import
+        project_root = Path(contracts.__file__).parents[2]
+        shutil.copytree(project_root / "src", tmp_path / "src")
+        shutil.copytree(project_root / "common", tmp_path / "common", dirs_exist_ok=True)
+        result = self._import_contracts(backend, tmp_path / "src")
+        assert result.returncode == 0, result.stderr
+
+    @pytest.mark.skipif(contracts.jsonschema_rs is None, reason="jsonschema_rs not installed")
+    def test_rs_backend_validation(self):
+        """Test validation results with the Rust-backed validator."""
+        validator = ContractValidator(backend="rs")
+        intent_data = {
+            "actor": {"id": "user_123", "type": "user"},
+            "channel": "web",
+            "geo": {"country": "US"},
+            "metadata": {},
+        }
+        assert validator.validate_json(intent_data, "intent_mandate") is True
+
+        intent_data["channel"] = "invalid_channel"
+        with pytest.raises(ContractValidationError):
+            validator.validate_json(intent_data, "intent_mandate")
+
+        errors = validator.get_validation_errors(intent_data, "intent_mandate")
+        assert [error["path"] for error in errors] == ["channel"]
+
+    @pytest.mark.parametrize(
+        "example_file",
+        sorted((Path(__file__).parent.parent / "examples" / "events").glob("*.json")),
+        ids=lambda path: path.stem,
+    )
+    def test_backends_agree_on_example_events(self, example_file):
+        """Test that every available backend gives the same verdicts on example events."""
+        backends = ["py"]
+        if contracts.jsonschema_rs is not None:
+            backends.append("rs")
+        if contracts.fastjsonschema is not None:
+            backends.append("codegen")
+        validators = [ContractValidator(backend=backend) for backend in backends]
+
+        event = json.loads(example_file.read_text())
+        schema_name = validators[0].schema_loader.ce_type_registry[event["type"]]
+
+        # The example itself, plus variants with each top-level and data field removed or nulled
+        payloads = [event]
+        for key in event:
+            payloads.append({k: v for k, v in event.items() if k != key})
+            payloads.append({**event, key: None})
+        for key in event["data"]:
+            payloads.append({**event, "data": {k: v for k, v in event["data"].items() if k != key}})
+            payloads.append({**event, "data": {**event["data"], key: None}})
+
+        for payload in payloads:
+            verdicts = {
+                validator.backend: validator._get_validator(schema_name, "events").is_valid(payload)
+                for validator in validators
+            }
+            assert len(set(verdicts.values())) == 1, (payload, verdicts)
+
+        assert validators[0]._get_validator(schema_name, "events").is_valid(event)
+
+    @pytest.mark.skipif(contracts.fastjsonschema is None, reason="fastjsonschema not installed")
+    def test_codegen_backend_validation(self):
+        """Test validation results with the code-generating validator."""
+        validator = ContractValidator(backend="codegen")
+        intent_data = {
+            "actor": {"id": "user_123", "type": "user"},
+            "channel": "web",
+            "geo": {"country": "US"},
+            "metadata": {},
+        }
+        assert validator.validate_json(intent_data, "intent_mandate") is True
+
+        intent_data["channel"] = "invalid_channel"
+        with pytest.raises(ContractValidationError):
+            validator.validate_json(intent_data, "intent_mandate")
+
+        errors = validator.get_validation_errors(intent_data, "intent_mandate")
+        assert [error["path"] for error in errors] == ["channel"]
+
+    @pytest.mark.skipif(contracts.fastjsonschema is None, reason="fastjsonschema not installed")
+    def test_codegen_backend_does_not_fill_defaults(self, tmp_path):
+        """Test that the code-generating validator leaves payloads unmodified."""
+        mandates_dir = tmp_path / "common" / "mandates"
+        mandates_dir.mkdir(parents=True)
+        schema = {"type": "object", "properties": {"channel": {"default": "web"}}}
+        (mandates_dir / "defaults.schema.json").write_text(json.dumps(schema))
+
+        validator = ContractValidator(SchemaLoader(tmp_path), backend="codegen")
+        payload = {}
+        assert validator.validate_json(payload, "defaults") is True
+        assert payload == {}
+
+    def test_codegen_backend_falls_back_without_package(self, monkeypatch):
+        """Test fallback to the pure-Python backend when fastjsonschema is missing."""
+        monkeypatch.setattr(contracts, "fastjsonschema", None)
+        validator = ContractValidator(backend="codegen")
+        assert validator.backend == "py"
+
 
 class TestConvenienceFunctions:
     """Test convenience functions."""
@@ -372,6 +874,11 @@ class TestErrorHandling:
         with pytest.raises(ContractValidationError):
             validator.validate_json(invalid_json, "intent_mandate")
 
+    def test_invalid_json_cloudevent_string(self, validator):
+        """Test handling of invalid JSON string CloudEvent."""
+        with pytest.raises(ContractValidationError, match="Invalid JSON payload"):
+            validator.validate_cloudevent("{not json", "ocn.orca.decision.v1")
+
     def test_nonexistent_schema(self, validator):
         """Test handling of nonexistent schema."""
         data = {"test": "data"}
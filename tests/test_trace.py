@@ -2,23 +2,54 @@
 Tests for trace utility functionality.
 """
 
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import threading
 import uuid
-from unittest.mock import MagicMock, patch
+from types import MappingProxyType
+
+import pytest
 
 from ocn_common.trace import (
+    _TRACE_HEADER_BYTES,
+    _UUID4_RE,
     TRACE_HEADER,
+    TraceCtx,
+    TraceMiddleware,
     clear_current_trace_id,
     create_trace_context,
     ensure_trace_id,
     format_trace_log,
     get_current_trace_id,
     inject_trace_id_ce,
+    log_trace,
     new_trace_id,
+    new_trace_ids,
     set_current_trace_id,
     trace_middleware,
 )
 
 
+def _assert_uuid4(trace_id):
+    """Assert that trace_id is a canonical hyphenated UUID4 string."""
+    assert isinstance(trace_id, str)
+    assert _UUID4_RE.fullmatch(trace_id), trace_id
+
+
+class _FakeApp:
+    """Minimal stand-in for a FastAPI app that records add_middleware() calls."""
+
+    def __init__(self):
+        self.user_middleware = []
+        self.added_middleware = []
+
+    def add_middleware(self, middleware_class, **options):
+        self.added_middleware.append(middleware_class)
+
+
 class TestTraceIDGeneration:
     """Test trace ID generation functionality."""
 
@@ -27,31 +58,86 @@ class TestTraceIDGeneration:
         trace_id = new_trace_id()
 
         # Should be a valid UUID4 string
-        assert isinstance(trace_id, str)
-        assert len(trace_id) == 36  # UUID4 format
-        assert trace_id.count("-") == 4  # UUID4 has 4 hyphens
+        _assert_uuid4(trace_id)
 
         # Should be parseable as UUID
         parsed_uuid = uuid.UUID(trace_id)
         assert parsed_uuid.version == 4  # UUID4
 
+    def test_new_trace_id_canonical_uuid4(self):
+        """Test that new_trace_id matches the canonical RFC 4122 UUID4 string form."""
+        for _ in range(100):
+            trace_id = new_trace_id()
+            parsed_uuid = uuid.UUID(trace_id)
+            assert parsed_uuid.variant == uuid.RFC_4122
+            assert str(parsed_uuid) == trace_id
+
     def test_new_trace_id_uniqueness(self):
-        """Test that new_trace_id generates unique IDs."""
-        trace_ids = [new_trace_id() for _ in range(100)]
+        """Test that new_trace_ids generates unique IDs."""
+        trace_ids = new_trace_ids(100)
 
         # All should be unique
+        assert len(trace_ids) == 100
         assert len(set(trace_ids)) == 100
 
+    def test_new_trace_ids_canonical_uuid4(self):
+        """Test that every batch-generated ID is a canonical RFC 4122 UUID4 string."""
+        for trace_id in new_trace_ids(500):
+            parsed_uuid = uuid.UUID(trace_id)
+            assert parsed_uuid.version == 4
+            assert parsed_uuid.variant == uuid.RFC_4122
+            assert str(parsed_uuid) == trace_id
+
+    def test_new_trace_ids_empty(self):
+        """Test that requesting zero IDs returns an empty list."""
+        assert new_trace_ids(0) == []
+
+    def test_new_trace_id_uniqueness_across_batch_refills(self):
+        """Test that IDs stay unique across several batch refills."""
+        trace_ids = [new_trace_id() for _ in range(2000)]
+
+        assert len(set(trace_ids)) == 2000
+
+    def test_new_trace_id_uniqueness_across_threads(self):
+        """Test that concurrent threads generate unique IDs."""
+        results = [[] for _ in range(8)]
+
+        def generate(ids):
+            ids.extend(new_trace_id() for _ in range(10_000))
+
+        threads = [threading.Thread(target=generate, args=(ids,)) for ids in results]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        all_ids = [trace_id for ids in results for trace_id in ids]
+        assert len(all_ids) == 80_000
+        assert len(set(all_ids)) == 80_000
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_new_trace_id_after_fork(self):
+        """Test that a forked child does not repeat the parent's buffered IDs."""
+        new_trace_id()  # Ensure the parent has pregenerated IDs
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            os.write(write_fd, new_trace_id().encode())
+            os._exit(0)
+
+        os.close(write_fd)
+        parent_trace_id = new_trace_id()
+        with os.fdopen(read_fd) as f:
+            child_trace_id = f.read()
+        os.waitpid(pid, 0)
+
+        assert child_trace_id != parent_trace_id
+
     def test_trace_id_format_consistency(self):
         """Test that trace IDs have consistent format."""
         for _ in range(10):
-            trace_id = new_trace_id()
-            # Should match UUID4 pattern
-            assert len(trace_id) == 36
-            assert trace_id[8] == "-"
-            assert trace_id[13] == "-"
-            assert trace_id[18] == "-"
-            assert trace_id[23] == "-"
+            _assert_uuid4(new_trace_id())
 
 
 class TestEnsureTraceID:
@@ -63,8 +149,7 @@ class TestEnsureTraceID:
         trace_id = ensure_trace_id(ctx)
 
         # Should generate new trace ID
-        assert isinstance(trace_id, str)
-        assert len(trace_id) == 36
+        _assert_uuid4(trace_id)
         assert ctx["trace_id"] == trace_id
 
     def test_ensure_trace_id_existing_trace_id(self):
@@ -83,8 +168,7 @@ class TestEnsureTraceID:
         trace_id = ensure_trace_id(ctx)
 
         # Should generate new trace ID
-        assert isinstance(trace_id, str)
-        assert len(trace_id) == 36
+        _assert_uuid4(trace_id)
         assert ctx["trace_id"] == trace_id
 
     def test_ensure_trace_id_none_context(self):
@@ -92,8 +176,7 @@ class TestEnsureTraceID:
         trace_id = ensure_trace_id(None)
 
         # Should generate new trace ID
-        assert isinstance(trace_id, str)
-        assert len(trace_id) == 36
+        _assert_uuid4(trace_id)
 
     def test_ensure_trace_id_none_trace_id(self):
         """Test ensure_trace_id with None trace ID."""
@@ -101,25 +184,50 @@ class TestEnsureTraceID:
         trace_id = ensure_trace_id(ctx)
 
         # Should generate new trace ID
-        assert isinstance(trace_id, str)
-        assert len(trace_id) == 36
+        _assert_uuid4(trace_id)
         assert ctx["trace_id"] == trace_id
 
+    def test_ensure_trace_id_trace_ctx(self):
+        """Test ensure_trace_id assigns a trace ID to a TraceCtx without one."""
+        ctx = TraceCtx()
+        trace_id = ensure_trace_id(ctx)
 
-class TestInjectTraceIDCE:
-    """Test CloudEvent trace ID injection functionality."""
+        _assert_uuid4(trace_id)
+        assert ctx.trace_id == trace_id
 
-    def test_inject_trace_id_ce_basic(self):
-        """Test basic trace ID injection into CloudEvent."""
-        envelope = {
+    def test_ensure_trace_id_trace_ctx_existing(self):
+        """Test ensure_trace_id keeps a valid trace ID already on a TraceCtx."""
+        existing_trace = "550e8400-e29b-41d4-a716-446655440000"
+        ctx = TraceCtx(existing_trace)
+
+        assert ensure_trace_id(ctx) == existing_trace
+        assert ctx.trace_id == existing_trace
+
+
+@pytest.fixture(scope="module")
+def ce_envelope():
+    """Read-only CloudEvent envelope template; copy with dict() before mutating."""
+    return MappingProxyType(
+        {
             "specversion": "1.0",
             "id": "event-123",
             "source": "https://example.com",
             "type": "ocn.orca.decision.v1",
+            "time": "2024-01-01T12:00:00Z",
+            "datacontenttype": "application/json",
+            "data": MappingProxyType({"decision": "APPROVE"}),
         }
+    )
+
+
+class TestInjectTraceIDCE:
+    """Test CloudEvent trace ID injection functionality."""
+
+    def test_inject_trace_id_ce_basic(self, ce_envelope):
+        """Test basic trace ID injection into CloudEvent."""
         trace_id = "trace-456"
 
-        result = inject_trace_id_ce(envelope, trace_id)
+        result = inject_trace_id_ce(dict(ce_envelope), trace_id)
 
         # Should add subject field
         assert result["subject"] == trace_id
@@ -129,14 +237,9 @@ class TestInjectTraceIDCE:
         assert result["source"] == "https://example.com"
         assert result["type"] == "ocn.orca.decision.v1"
 
-    def test_inject_trace_id_ce_existing_subject(self):
+    def test_inject_trace_id_ce_existing_subject(self, ce_envelope):
         """Test trace ID injection overwrites existing subject."""
-        envelope = {
-            "specversion": "1.0",
-            "id": "event-123",
-            "subject": "old-subject",
-            "type": "ocn.orca.decision.v1",
-        }
+        envelope = dict(ce_envelope, subject="old-subject")
         trace_id = "trace-456"
 
         result = inject_trace_id_ce(envelope, trace_id)
@@ -145,9 +248,9 @@ class TestInjectTraceIDCE:
         assert result["subject"] == trace_id
         assert result["subject"] != "old-subject"
 
-    def test_inject_trace_id_ce_preserves_original(self):
+    def test_inject_trace_id_ce_preserves_original(self, ce_envelope):
         """Test that original envelope is not modified."""
-        envelope = {"specversion": "1.0", "id": "event-123", "type": "ocn.orca.decision.v1"}
+        envelope = dict(ce_envelope)
         original_envelope = envelope.copy()
         trace_id = "trace-456"
 
@@ -157,31 +260,34 @@ class TestInjectTraceIDCE:
         assert envelope == original_envelope
         assert envelope is not result  # Should be different objects
 
-    def test_inject_trace_id_ce_complete_envelope(self):
+    def test_inject_trace_id_ce_shallow_copy(self, ce_envelope):
+        """Test that nested data is shared with the original rather than copied."""
+        envelope = dict(ce_envelope)
+
+        result = inject_trace_id_ce(envelope, "trace-456")
+
+        assert result["data"] is envelope["data"]
+        assert "subject" not in envelope
+
+    def test_inject_trace_id_ce_inplace(self, ce_envelope):
+        """Test in-place trace ID injection modifies and returns the given envelope."""
+        envelope = dict(ce_envelope)
+        trace_id = "trace-456"
+
+        result = inject_trace_id_ce(envelope, trace_id, inplace=True)
+
+        assert result is envelope
+        assert envelope["subject"] == trace_id
+        assert envelope["id"] == "event-123"
+
+    def test_inject_trace_id_ce_complete_envelope(self, ce_envelope):
         """Test trace ID injection with complete CloudEvent envelope."""
-        envelope = {
-            "specversion": "1.0",
-            "id": "event-123",
-            "source": "https://example.com",
-            "type": "ocn.orca.decision.v1",
-            "time": "2024-01-01T12:00:00Z",
-            "datacontenttype": "application/json",
-            "data": {"decision": "APPROVE"},
-        }
         trace_id = "trace-456"
 
-        result = inject_trace_id_ce(envelope, trace_id)
+        result = inject_trace_id_ce(dict(ce_envelope), trace_id)
 
-        # Should add subject
-        assert result["subject"] == trace_id
-        # Should preserve all other fields
-        assert result["specversion"] == envelope["specversion"]
-        assert result["id"] == envelope["id"]
-        assert result["source"] == envelope["source"]
-        assert result["type"] == envelope["type"]
-        assert result["time"] == envelope["time"]
-        assert result["datacontenttype"] == envelope["datacontenttype"]
-        assert result["data"] == envelope["data"]
+        # Should add subject and preserve all other fields
+        assert result == {**ce_envelope, "subject": trace_id}
 
 
 class TestContextManagement:
@@ -214,17 +320,36 @@ class TestContextManagement:
         clear_current_trace_id()
         assert get_current_trace_id() is None
 
+    def test_clear_current_trace_id_with_token(self):
+        """Test that clearing with a token restores the previous trace ID."""
+        previous_trace_id = get_current_trace_id()
+        outer_token = set_current_trace_id("outer-trace")
+        inner_token = set_current_trace_id("inner-trace")
+        assert get_current_trace_id() == "inner-trace"
+
+        clear_current_trace_id(inner_token)
+        assert get_current_trace_id() == "outer-trace"
+
+        clear_current_trace_id(outer_token)
+        assert get_current_trace_id() == previous_trace_id
+
     def test_context_isolation(self):
         """Test that context variables are properly isolated."""
-        # Set trace ID in one context
-        set_current_trace_id("trace-1")
-        assert get_current_trace_id() == "trace-1"
+        token = set_current_trace_id("outer")
 
-        # In a real async context, this would be isolated
-        # For testing, we simulate by clearing and setting again
-        clear_current_trace_id()
-        set_current_trace_id("trace-2")
-        assert get_current_trace_id() == "trace-2"
+        def set_and_get(trace_id):
+            set_current_trace_id(trace_id)
+            return get_current_trace_id()
+
+        # Each copied context sees the outer value but keeps its own changes
+        context_a = contextvars.copy_context()
+        context_b = contextvars.copy_context()
+        assert context_a.run(set_and_get, "trace-1") == "trace-1"
+        assert context_b.run(set_and_get, "trace-2") == "trace-2"
+        assert context_a.run(get_current_trace_id) == "trace-1"
+        assert get_current_trace_id() == "outer"
+
+        clear_current_trace_id(token)
 
 
 class TestTraceMiddleware:
@@ -232,31 +357,83 @@ class TestTraceMiddleware:
 
     def test_trace_middleware_adds_middleware(self):
         """Test that trace_middleware adds middleware to FastAPI app."""
-        # Mock FastAPI app
-        mock_app = MagicMock()
-        mock_app.user_middleware = []
+        app = _FakeApp()
 
-        # Mock FastAPI imports to simulate FastAPI being available
-        with patch.dict(
-            "sys.modules", {"fastapi": MagicMock(), "starlette.middleware.base": MagicMock()}
-        ):
-            # Add trace middleware
-            result = trace_middleware(mock_app)
+        result = trace_middleware(app)
 
-            # Should have added one middleware when FastAPI is available
-            assert mock_app.add_middleware.call_count == 1
-            assert result is mock_app
+        # Should have registered exactly the trace middleware
+        assert app.added_middleware == [TraceMiddleware]
+        assert result is app
 
     def test_trace_middleware_returns_app(self):
         """Test that trace_middleware returns the app for chaining."""
-        # Mock FastAPI app
-        mock_app = MagicMock()
-        mock_app.user_middleware = []
+        app = _FakeApp()
 
-        result = trace_middleware(mock_app)
+        result = trace_middleware(app)
 
         # Should return the same app instance
-        assert result is mock_app
+        assert result is app
+
+
+class TestTraceASGIMiddleware:
+    """Test the ASGI trace middleware."""
+
+    @staticmethod
+    def _run(scope, outer_trace_id=None):
+        """Run a request through TraceMiddleware, returning (app trace ID, messages, after)."""
+        seen = {}
+        sent = []
+
+        async def app(scope, receive, send):
+            seen["trace_id"] = get_current_trace_id()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        async def receive():
+            return {"type": "http.request"}
+
+        async def send(message):
+            sent.append(message)
+
+        async def request():
+            set_current_trace_id(outer_trace_id)
+            await TraceMiddleware(app)(scope, receive, send)
+            return get_current_trace_id()
+
+        after = asyncio.run(request())
+        return seen.get("trace_id"), sent, after
+
+    def test_propagates_header_trace_id(self):
+        """Test that the request header trace ID is used and echoed back."""
+        trace_id = "550e8400-e29b-41d4-a716-446655440000"
+        scope = {"type": "http", "headers": [(b"x-ocn-trace-id", trace_id.encode())]}
+
+        seen, sent, _ = self._run(scope)
+
+        assert seen == trace_id
+        assert (b"x-ocn-trace-id", trace_id.encode()) in sent[0]["headers"]
+
+    def test_generates_missing_trace_id(self):
+        """Test that a trace ID is generated when the header is missing."""
+        seen, sent, _ = self._run({"type": "http", "headers": []})
+
+        assert uuid.UUID(seen).version == 4
+        assert sent[0]["headers"] == [(b"x-ocn-trace-id", seen.encode())]
+
+    def test_restores_previous_trace_id(self):
+        """Test that the previous trace ID is restored after the request."""
+        scope = {"type": "http", "headers": [(b"x-ocn-trace-id", b"inner-trace")]}
+        seen, _, after = self._run(scope, outer_trace_id="outer-trace")
+
+        assert seen == "inner-trace"
+        assert after == "outer-trace"
+
+    def test_non_http_scope_passthrough(self):
+        """Test that non-HTTP scopes are passed through untouched."""
+        seen, sent, _ = self._run({"type": "websocket", "headers": []})
+
+        assert seen is None
+        assert sent[0]["headers"] == []
 
 
 class TestTraceContextCreation:
@@ -267,8 +444,7 @@ class TestTraceContextCreation:
         ctx = create_trace_context()
 
         assert "trace_id" in ctx
-        assert isinstance(ctx["trace_id"], str)
-        assert len(ctx["trace_id"]) == 36  # UUID4 format
+        _assert_uuid4(ctx["trace_id"])
         assert ctx["service"] == "ocn-common"
         assert ctx["version"] == "1.0.0"
 
@@ -292,6 +468,28 @@ class TestTraceContextCreation:
             assert isinstance(ctx[field], str)
             assert len(ctx[field]) > 0
 
+    def test_create_trace_context_mapping_compatibility(self):
+        """Test that TraceCtx still behaves like the previous dict."""
+        ctx = create_trace_context("custom-trace-123")
+
+        assert isinstance(ctx, TraceCtx)
+        assert ctx.trace_id == "custom-trace-123"
+        assert ctx == {"trace_id": "custom-trace-123", "service": "ocn-common", "version": "1.0.0"}
+        assert dict(ctx) == {**ctx}
+        assert "user_id" not in ctx
+        with pytest.raises(KeyError):
+            ctx["user_id"]
+
+    def test_trace_ctx_as_dict(self):
+        """Test that as_dict returns an independent, JSON-serializable dict."""
+        ctx = create_trace_context("custom-trace-123")
+
+        data = ctx.as_dict()
+        data["user_id"] = "456"
+
+        assert json.loads(json.dumps(data))["trace_id"] == "custom-trace-123"
+        assert "user_id" not in ctx
+
 
 class TestTraceLogFormatting:
     """Test trace log formatting functionality."""
@@ -331,6 +529,12 @@ class TestTraceLogFormatting:
         # Should not have extra spaces or context
         assert log == f"[trace_id={trace_id}] {message}"
 
+    def test_format_trace_log_exact_output(self):
+        """Test the full formatted line, with context in keyword order."""
+        log = format_trace_log("trace-123", "Done", status="ok", duration_ms=150, retries=0)
+
+        assert log == "[trace_id=trace-123] Done status=ok duration_ms=150 retries=0"
+
     def test_format_trace_log_multiple_context(self):
         """Test trace log formatting with multiple context items."""
         trace_id = "trace-123"
@@ -350,41 +554,56 @@ class TestTraceLogFormatting:
         for key, value in context.items():
             assert f"{key}={value}" in log
 
+    def test_log_trace_passes_extras(self, caplog):
+        """Test that log_trace attaches trace ID and context as record attributes."""
+        logger = logging.getLogger("ocn_common.tests.trace")
 
-class TestIntegration:
-    """Integration tests for trace utilities."""
+        with caplog.at_level(logging.INFO, logger=logger.name):
+            log_trace(logger, logging.INFO, "trace-123", "Processing request", user_id="456")
 
-    def test_full_trace_workflow(self):
-        """Test complete trace workflow from generation to CloudEvent injection."""
-        # Generate new trace ID
-        trace_id = new_trace_id()
-        assert isinstance(trace_id, str)
-        assert len(trace_id) == 36
+        (record,) = caplog.records
+        assert record.getMessage() == "Processing request"
+        assert record.trace_id == "trace-123"
+        assert record.user_id == "456"
+        # The record points at the caller, not at log_trace itself
+        assert record.funcName == "test_log_trace_passes_extras"
+        assert record.pathname == __file__
 
-        # Ensure trace ID in context
-        ctx = {"user_id": "123"}
-        ensured_trace_id = ensure_trace_id(ctx)
-        assert ensured_trace_id == ctx["trace_id"]
+    def test_log_trace_disabled_level(self, caplog):
+        """Test that log_trace emits nothing below the logger's level."""
+        logger = logging.getLogger("ocn_common.tests.trace")
 
-        # Set in context variable
-        set_current_trace_id(trace_id)
-        assert get_current_trace_id() == trace_id
+        with caplog.at_level(logging.WARNING, logger=logger.name):
+            log_trace(logger, logging.DEBUG, "trace-123", "Noise")
 
-        # Create CloudEvent envelope
-        envelope = {"specversion": "1.0", "id": "event-123", "type": "ocn.orca.decision.v1"}
+        assert caplog.records == []
 
-        # Inject trace ID
-        modified_envelope = inject_trace_id_ce(envelope, trace_id)
-        assert modified_envelope["subject"] == trace_id
 
-        # Format log message
-        log = format_trace_log(trace_id, "Request processed", user_id="123")
-        assert f"[trace_id={trace_id}]" in log
-        assert "user_id=123" in log
+@pytest.fixture
+def trace_workflow(ce_envelope):
+    """Run the trace flow end to end, yielding (trace_id, ctx, envelope, log)."""
+    ctx = {"user_id": "123"}
+    trace_id = ensure_trace_id(ctx)
+    token = set_current_trace_id(trace_id)
+    envelope = inject_trace_id_ce(dict(ce_envelope), trace_id)
+    log = format_trace_log(trace_id, "Request processed", user_id=ctx["user_id"])
 
-        # Clean up
-        clear_current_trace_id()
-        assert get_current_trace_id() is None
+    yield trace_id, ctx, envelope, log
+
+    clear_current_trace_id(token)
+
+
+class TestIntegration:
+    """Integration tests for trace utilities."""
+
+    def test_full_trace_workflow(self, trace_workflow):
+        """Test complete trace workflow from generation to CloudEvent injection."""
+        trace_id, ctx, envelope, log = trace_workflow
+
+        # Every stage should carry the same trace ID
+        assert (ctx["trace_id"], get_current_trace_id(), envelope["subject"]) == (trace_id,) * 3
+        assert log == f"[trace_id={trace_id}] Request processed user_id=123"
+        _assert_uuid4(trace_id)
 
     def test_trace_header_constant(self):
         """Test that TRACE_HEADER constant is properly defined."""
@@ -392,23 +611,49 @@ class TestIntegration:
         assert isinstance(TRACE_HEADER, str)
         assert len(TRACE_HEADER) > 0
 
+    def test_trace_header_bytes_constant(self):
+        """Test that the ASGI header key matches TRACE_HEADER."""
+        assert _TRACE_HEADER_BYTES.decode() == TRACE_HEADER
+
 
 class TestEdgeCases:
     """Test edge cases and error conditions."""
 
-    def test_ensure_trace_id_malformed_trace_id(self):
+    @pytest.mark.parametrize("malformed_id", ["", " ", "invalid-uuid", "too-short", "x" * 100])
+    def test_ensure_trace_id_malformed_trace_id(self, malformed_id):
         """Test ensure_trace_id with malformed existing trace ID."""
-        # Test with various malformed trace IDs
-        malformed_ids = ["", " ", "invalid-uuid", "too-short", "x" * 100]
+        ctx = {"trace_id": malformed_id}
+        trace_id = ensure_trace_id(ctx)
+
+        # Should generate a new valid trace ID
+        _assert_uuid4(trace_id)
+        assert ctx["trace_id"] == trace_id
+
+    @pytest.mark.parametrize("existing", [str(uuid.uuid1()), 12345])
+    def test_ensure_trace_id_non_uuid4_trace_id(self, existing):
+        """Test ensure_trace_id replaces UUIDs of other versions and non-string values."""
+        ctx = {"trace_id": existing}
+        trace_id = ensure_trace_id(ctx)
+
+        assert trace_id != existing
+        _assert_uuid4(trace_id)
+
+    def test_ensure_trace_id_trailing_newline(self):
+        """Test ensure_trace_id rejects a UUID4 followed by a newline."""
+        existing = "550e8400-e29b-41d4-a716-446655440000\n"
+        ctx = {"trace_id": existing}
+
+        trace_id = ensure_trace_id(ctx)
+
+        assert trace_id != existing
+        assert ctx["trace_id"] == trace_id
 
-        for malformed_id in malformed_ids:
-            ctx = {"trace_id": malformed_id}
-            trace_id = ensure_trace_id(ctx)
+    def test_ensure_trace_id_uppercase_trace_id(self):
+        """Test ensure_trace_id keeps an uppercase UUID4 trace ID."""
+        existing = "550E8400-E29B-41D4-A716-446655440000"
+        ctx = {"trace_id": existing}
 
-            # Should generate a new valid trace ID
-            assert isinstance(trace_id, str)
-            assert len(trace_id) == 36
-            assert ctx["trace_id"] == trace_id
+        assert ensure_trace_id(ctx) == existing
 
     def test_inject_trace_id_ce_empty_envelope(self):
         """Test inject_trace_id_ce with empty envelope."""